@@ -36,42 +36,52 @@ def main():
     # Connect to Salesforce
     print("Connecting to Salesforce...")
     sf = sf_client.connect()
-    sf_holder = [sf]
     instance_url = f"https://{sf.sf_instance}"
     print(f"Connected to {sf.sf_instance}")
 
     # Fetch qualifying opportunities
     print("Querying opportunities...")
-    opps = opportunities.get_human_touched_opportunities(sf_holder)
+    opps = opportunities.get_human_touched_opportunities()
     print(f"Found {len(opps)} opportunities with 2+ human touches")
 
-    # Group opportunities by owner email
+    # Group opportunities by owner email (Owner.Email is selected by the SOQL,
+    # so no fallback dicts are allocated per row)
     opps_by_owner = defaultdict(list)
     for opp in opps:
-        owner_email = (opp.get("Owner", {}) or {}).get("Email", "")
-        if owner_email:
+        owner = opp.get("Owner")
+        if owner and (owner_email := owner.get("Email")):
             opps_by_owner[owner_email.lower()].append(opp)
 
-    # Send personalized emails to all subscribers (even if they have 0 opps)
+    # Render personalized emails for all subscribers (even if they have 0 opps),
+    # then send them all in one batched Gmail round-trip. Subscribers without
+    # opportunities all get the same report, so it is rendered at most once.
     today = date.today().strftime("%B %d, %Y")
     cc = load_cc()
-    sent = 0
+    outbox = []
+
+    to_send = {s: opps_by_owner[s] for s in subscribers & opps_by_owner.keys()}
+    empty_report = None
 
     for subscriber in subscribers:
-        owner_opps = opps_by_owner.get(subscriber, [])
-        owner_name = "there"
+        owner_opps = to_send.get(subscriber)
         if owner_opps:
             owner_name = (owner_opps[0].get("Owner", {}) or {}).get("Name", "there")
-
-        subject, html = report_template.render_report(
-            owner_opps, today, instance_url, owner_name,
-        )
-
-        print(f"Sending {len(owner_opps)} opportunities to {subscriber}...")
-        email_sender.send_report(subject, html, [subscriber], cc=cc)
-        sent += 1
-
-    print(f"Done. Sent reports to {sent} owner(s).")
+            subject, html = report_template.render_report(
+                owner_opps, today, instance_url, owner_name,
+            )
+        else:
+            owner_opps = []
+            if empty_report is None:
+                empty_report = report_template.render_report(
+                    [], today, instance_url, "there",
+                )
+            subject, html = empty_report
+
+        print(f"Queuing {len(owner_opps)} opportunities for {subscriber}...")
+        outbox.append((subject, html, [subscriber]))
+
+    email_sender.send_reports(outbox, cc=cc)
+    print(f"Done. Sent reports to {len(outbox)} owner(s).")
 
 
 if __name__ == "__main__":
@@ -86,14 +86,14 @@ def _classify_group(contacts):
     return "cross_account"
 
 
-def _query_opp_counts(sf_holder, account_ids):
+def _query_opp_counts(account_ids):
     """Query opportunity counts per account in batches. Returns {account_id: count}."""
     opp_counts = {}
     account_list = list(account_ids)
     for i in range(0, len(account_list), BATCH_SIZE):
         batch = account_list[i:i + BATCH_SIZE]
         soql = OPP_COUNT_TEMPLATE.format(ids=_ids_csv(batch))
-        results = sf_client.query(sf_holder, soql)
+        results = sf_client.query(soql)
         for r in results:
             opp_counts[r["AccountId"]] = r["cnt"]
     return opp_counts
@@ -415,16 +415,15 @@ def build_report_html(same_account, cross_account, partial_account,
 def main():
     print("Connecting to Salesforce...")
     sf = sf_client.connect()
-    sf_holder = [sf]
     instance_url = f"https://{sf.sf_instance}"
     print(f"Connected to {sf.sf_instance}")
 
     print("Querying Contacts...")
-    contacts = sf_client.query(sf_holder, CONTACT_SOQL)
+    contacts = sf_client.query(CONTACT_SOQL)
     print(f"  {len(contacts):,} contacts with email")
 
     print("Querying indirect AccountContactRelations...")
-    acrs = sf_client.query(sf_holder, ACR_SOQL)
+    acrs = sf_client.query(ACR_SOQL)
     print(f"  {len(acrs):,} indirect ACRs")
 
     # Build ACR index: {contact_id: [acr records]}
@@ -463,7 +462,7 @@ def main():
                 all_account_ids.add(c["AccountId"])
 
     print(f"Querying opportunity counts for {len(all_account_ids):,} accounts...")
-    opp_counts = _query_opp_counts(sf_holder, all_account_ids)
+    opp_counts = _query_opp_counts(all_account_ids)
     print(f"  {len(opp_counts):,} accounts have opportunities")
 
     # Build and send report
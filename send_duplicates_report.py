@@ -364,7 +364,6 @@ def build_report_html(object_results, cross_overlaps, instance_url):
 def main():
     print("Connecting to Salesforce...")
     sf = sf_client.connect()
-    sf_holder = [sf]
     instance_url = f"https://{sf.sf_instance}"
     print(f"Connected to {sf.sf_instance}")
 
@@ -374,7 +373,7 @@ def main():
 
     for label, soql, email_field, display_fields in OBJECTS:
         print(f"Querying {label}...")
-        records = sf_client.query(sf_holder, soql)
+        records = sf_client.query(soql)
         total = len(records)
         print(f"  {label}: {total:,} records with email")
 
@@ -311,21 +311,20 @@ def build_report_html(matches, lead_only_dupes, instance_url):
 def main():
     print("Connecting to Salesforce...")
     sf = sf_client.connect()
-    sf_holder = [sf]
     instance_url = f"https://{sf.sf_instance}"
     print(f"Connected to {sf.sf_instance}")
 
     # Query all three objects
     print("Querying Leads...")
-    leads = sf_client.query(sf_holder, LEAD_SOQL)
+    leads = sf_client.query(LEAD_SOQL)
     print(f"  {len(leads):,} leads with email")
 
     print("Querying Accounts...")
-    accounts = sf_client.query(sf_holder, ACCOUNT_SOQL)
+    accounts = sf_client.query(ACCOUNT_SOQL)
     print(f"  {len(accounts):,} accounts with email")
 
     print("Querying Contacts...")
-    contacts = sf_client.query(sf_holder, CONTACT_SOQL)
+    contacts = sf_client.query(CONTACT_SOQL)
     print(f"  {len(contacts):,} contacts with email")
 
     # Build email indexes for accounts and contacts
@@ -63,16 +63,16 @@ def _batch_ids(ids: list[str]) -> list[list[str]]:
     return [ids[i:i + BATCH_SIZE] for i in range(0, len(ids), BATCH_SIZE)]
 
 
-def _query_batched(sf_holder: list, template: str, ids: list[str]) -> list[dict]:
+def _query_batched(template: str, ids: list[str]) -> list[dict]:
     results = []
     for batch in _batch_ids(ids):
         soql = template.format(ids=_ids_csv(batch))
-        results.extend(sf_client.query(sf_holder, soql))
+        results.extend(sf_client.query(soql))
     return results
 
 
-def _get_human_user_ids(sf_holder: list, user_ids: list[str]) -> set[str]:
-    users = _query_batched(sf_holder, USERS_SOQL_TEMPLATE, user_ids)
+def _get_human_user_ids(user_ids: list[str]) -> set[str]:
+    users = _query_batched(USERS_SOQL_TEMPLATE, user_ids)
     human_ids = set()
     for user in users:
         name = user.get("Name", "")
@@ -89,20 +89,20 @@ def _get_human_user_ids(sf_holder: list, user_ids: list[str]) -> set[str]:
     return human_ids
 
 
-def fetch_mkt_campaign_data(sf_holder: list) -> tuple[list[dict], dict[str, int]]:
+def fetch_mkt_campaign_data() -> tuple[list[dict], dict[str, int]]:
     """Fetch MKT Campaign opps and return (opps, touch_counts)."""
-    opps = sf_client.query(sf_holder, OPPS_SOQL)
+    opps = sf_client.query(OPPS_SOQL)
     if not opps:
         return [], {}
 
     opp_ids = [o["Id"] for o in opps]
 
     # Get Tasks linked to these opps
-    tasks = _query_batched(sf_holder, TASKS_SOQL_TEMPLATE, opp_ids)
+    tasks = _query_batched(TASKS_SOQL_TEMPLATE, opp_ids)
 
     # Filter to human-created tasks
     all_user_ids = {t["CreatedById"] for t in tasks}
-    human_ids = _get_human_user_ids(sf_holder, list(all_user_ids)) if all_user_ids else set()
+    human_ids = _get_human_user_ids(list(all_user_ids)) if all_user_ids else set()
 
     # Count human touches per opportunity
     touch_counts = defaultdict(int)
@@ -268,13 +268,12 @@ def main():
     # Connect to Salesforce
     print("Connecting to Salesforce...")
     sf = sf_client.connect()
-    sf_holder = [sf]
     instance_url = f"https://{sf.sf_instance}"
     print(f"Connected to {sf.sf_instance}")
 
     # Fetch data
     print("Querying MKT Campaign opportunities...")
-    opps, touch_counts = fetch_mkt_campaign_data(sf_holder)
+    opps, touch_counts = fetch_mkt_campaign_data()
     print(f"Found {len(opps)} active MKT Campaign opportunities")
 
     if not opps:
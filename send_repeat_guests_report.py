@@ -29,14 +29,14 @@ def _ids_csv(ids):
     return ",".join(f"'{id_}'" for id_ in ids)
 
 
-def _query_opps_for_accounts(sf_holder, account_ids):
+def _query_opps_for_accounts(account_ids):
     """Query all opportunities linked to the given account IDs."""
     opps_by_account = defaultdict(list)
     account_list = list(account_ids)
     for i in range(0, len(account_list), BATCH_SIZE):
         batch = account_list[i:i + BATCH_SIZE]
         soql = OPPS_BY_ACCOUNT_TEMPLATE.format(ids=_ids_csv(batch))
-        opps = sf_client.query(sf_holder, soql)
+        opps = sf_client.query(soql)
         for o in opps:
             opps_by_account[o["AccountId"]].append(o)
     return opps_by_account
@@ -321,13 +321,12 @@ def build_report_html(guests_with_opps, guests_without_opps, instance_url):
 def main():
     print("Connecting to Salesforce...")
     sf = sf_client.connect()
-    sf_holder = [sf]
     instance_url = f"https://{sf.sf_instance}"
     print(f"Connected to {sf.sf_instance}")
 
     # Query all guest records with email
     print("Querying guest records...")
-    records = sf_client.query(sf_holder, GUESTS_SOQL)
+    records = sf_client.query(GUESTS_SOQL)
     print(f"Found {len(records)} guest records with email")
 
     # Group by email to find repeat guests
@@ -343,7 +342,7 @@ def main():
 
     # Query opportunities for these accounts
     print(f"Querying opportunities for {len(account_ids)} accounts...")
-    opps_by_account = _query_opps_for_accounts(sf_holder, account_ids)
+    opps_by_account = _query_opps_for_accounts(account_ids)
 
     # Build guest summaries
     guests_with_opps = []
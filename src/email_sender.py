@@ -20,6 +20,13 @@ SCOPES = [
 ]
 TOKEN_CACHE = Path(__file__).parent.parent / ".gmail_token.json"
 
+GMAIL_BATCH_LIMIT = 100  # Gmail API caps batch requests at 100 calls
+
+# Credentials and the discovery-built service are expensive to construct
+# (token refresh round-trip, discovery document parse) — build once per process.
+_CREDS: Credentials | None = None
+_SERVICE = None
+
 
 def _get_credentials() -> Credentials:
     """Get Gmail OAuth credentials, refreshing or prompting as needed."""
@@ -74,17 +81,31 @@ def _save_token(creds: Credentials):
     TOKEN_CACHE.write_text(creds.to_json())
 
 
-def send_report(
+def _get_service():
+    """Return a Gmail API service, reusing cached credentials and client."""
+    global _CREDS, _SERVICE
+    if _CREDS is None:
+        _CREDS = _get_credentials()
+    elif _CREDS.expired and _CREDS.refresh_token:
+        _CREDS.refresh(Request())
+    if _SERVICE is None:
+        _SERVICE = build(
+            "gmail", "v1",
+            credentials=_CREDS,
+            cache_discovery=False,
+            static_discovery=True,
+        )
+    return _SERVICE
+
+
+def _build_raw_message(
     subject: str,
     html_body: str,
     recipients: list[str],
+    sender: str,
     cc: list[str] | None = None,
-) -> None:
-    """Send an HTML email to all recipients via Gmail API."""
-    sender = os.environ.get("GMAIL_SENDER", "me")
-    creds = _get_credentials()
-    service = build("gmail", "v1", credentials=creds)
-
+) -> str:
+    """Build a base64url-encoded MIME message for the Gmail API."""
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
     msg["From"] = sender
@@ -96,11 +117,65 @@ def send_report(
     msg.attach(MIMEText(plain_text, "plain"))
     msg.attach(MIMEText(html_body, "html"))
 
-    all_recipients = recipients + (cc or [])
-    raw = base64.urlsafe_b64encode(msg.as_bytes()).decode()
+    return base64.urlsafe_b64encode(msg.as_bytes()).decode()
+
+
+def send_report(
+    subject: str,
+    html_body: str,
+    recipients: list[str],
+    cc: list[str] | None = None,
+) -> None:
+    """Send an HTML email to all recipients via Gmail API."""
+    sender = os.environ.get("GMAIL_SENDER", "me")
+    service = _get_service()
+
+    raw = _build_raw_message(subject, html_body, recipients, sender, cc=cc)
     service.users().messages().send(
         userId="me",
         body={"raw": raw},
     ).execute()
 
+    all_recipients = recipients + (cc or [])
     print(f"Report sent to {len(all_recipients)} recipient(s).")
+
+
+def send_reports(
+    messages: list[tuple[str, str, list[str]]],
+    cc: list[str] | None = None,
+) -> None:
+    """Send multiple HTML emails in batched Gmail API round-trips.
+
+    messages is a list of (subject, html_body, recipients) tuples. Sends are
+    issued via BatchHttpRequest so N messages cost ~1 HTTP round-trip per 100
+    instead of one blocking round-trip each. Per-message failures are reported
+    via the batch callback and raised after the whole batch completes.
+    """
+    if not messages:
+        return
+
+    sender = os.environ.get("GMAIL_SENDER", "me")
+    service = _get_service()
+
+    errors = []
+
+    def _on_sent(request_id, response, exception):
+        if exception is not None:
+            errors.append((request_id, exception))
+
+    for start in range(0, len(messages), GMAIL_BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=_on_sent)
+        for subject, html_body, recipients in messages[start:start + GMAIL_BATCH_LIMIT]:
+            raw = _build_raw_message(subject, html_body, recipients, sender, cc=cc)
+            batch.add(service.users().messages().send(
+                userId="me",
+                body={"raw": raw},
+            ))
+        batch.execute()
+
+    if errors:
+        for request_id, exc in errors:
+            print(f"Send failed (batch request {request_id}): {exc}")
+        raise RuntimeError(f"{len(errors)} of {len(messages)} report sends failed")
+
+    print(f"Sent {len(messages)} report(s) in batched mode.")
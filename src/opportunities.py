@@ -1,7 +1,9 @@
 """Query open Salesforce Opportunities and count human touches (Tasks only)."""
 
-from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from operator import itemgetter
 
 from src import sf_client
 
@@ -18,6 +20,8 @@ NON_HUMAN_USERNAMES = {
 }
 
 BATCH_SIZE = 200
+_SORT_KEY = itemgetter("_sort_key")  # stale first, then most touches first
+MAX_QUERY_WORKERS = 4  # stay well under Salesforce per-user concurrent request limits
 STALE_THRESHOLD_DAYS = 60  # 2 months
 
 OPEN_OPPS_SOQL = """
@@ -32,11 +36,23 @@ OPEN_OPPS_SOQL = """
     ORDER BY LastModifiedDate DESC
 """
 
-TASKS_SOQL_TEMPLATE = """
-    SELECT Id, WhatId, CreatedById, CreatedDate
+# Human-only touch aggregates: the non-human exclusion runs server-side as a
+# semi-join on User, so bot-authored Task rows are never transferred and no
+# separate User query is needed
+TASKS_AGG_SOQL_TEMPLATE = """
+    SELECT WhatId, COUNT(Id) cnt, MAX(CreatedDate) lastTouch
     FROM Task
     WHERE WhatId IN ({ids})
-"""
+      AND CreatedById IN (
+        SELECT Id FROM User
+        WHERE Profile.UserLicense.Name NOT IN (%s)
+          AND Name NOT IN (%s)
+      )
+    GROUP BY WhatId
+""" % (
+    ", ".join(f"'{name}'" for name in sorted(NON_HUMAN_LICENSES)),
+    ", ".join(f"'{name}'" for name in sorted(NON_HUMAN_USERNAMES)),
+)
 
 USERS_SOQL_TEMPLATE = """
     SELECT Id, Name, Profile.UserLicense.Name
@@ -47,7 +63,9 @@ USERS_SOQL_TEMPLATE = """
 
 def _ids_csv(ids: list[str]) -> str:
     """Format IDs for SOQL IN clause: 'id1','id2','id3'."""
-    return ",".join(f"'{id_}'" for id_ in ids)
+    # Salesforce IDs are plain alphanumerics, so a single join on a quoted
+    # separator beats formatting each ID through a generator
+    return "'" + "','".join(ids) + "'"
 
 
 def _batch_ids(ids: list[str]) -> list[list[str]]:
@@ -55,18 +73,33 @@ def _batch_ids(ids: list[str]) -> list[list[str]]:
     return [ids[i:i + BATCH_SIZE] for i in range(0, len(ids), BATCH_SIZE)]
 
 
-def _query_batched(sf_holder: list, template: str, ids: list[str]) -> list[dict]:
-    """Run a SOQL query template in batches over a list of IDs."""
-    results = []
-    for batch in _batch_ids(ids):
-        soql = template.format(ids=_ids_csv(batch))
-        results.extend(sf_client.query(sf_holder, soql))
-    return results
+def _query_batched(template: str, ids: list[str]) -> Iterator[dict]:
+    """Run a SOQL query template in batches over a list of IDs, yielding records.
+
+    Batches are issued concurrently — each call is dominated by HTTP round-trip
+    time to Salesforce, not CPU — so wall time is ~ceil(batches / workers) RTTs.
+    Records are streamed batch-by-batch instead of collected into one list, so
+    consumers aggregate while later batches are still in flight and the full
+    result set is never buffered twice. Within a batch, sf_client.query_iter
+    overlaps nextRecordsUrl paging with consumption.
+    """
+    batches = _batch_ids(ids)
+
+    def _run(batch: list[str]) -> list[dict]:
+        return list(sf_client.query_iter(template.format(ids=_ids_csv(batch))))
+
+    with ThreadPoolExecutor(max_workers=MAX_QUERY_WORKERS) as executor:
+        for records in executor.map(_run, batches):
+            yield from records
+
 
+def _get_human_user_ids(user_ids: list[str]) -> frozenset[str]:
+    """Query users and return the set of IDs that are human (not automated).
 
-def _get_human_user_ids(sf_holder: list, user_ids: list[str]) -> set[str]:
-    """Query users and return the set of IDs that are human (not automated)."""
-    users = _query_batched(sf_holder, USERS_SOQL_TEMPLATE, user_ids)
+    Debug helper — the report path filters non-human users server-side via the
+    semi-join in TASKS_AGG_SOQL_TEMPLATE. Kept for ad-hoc license auditing.
+    """
+    users = _query_batched(USERS_SOQL_TEMPLATE, user_ids)
     human_ids = set()
     for user in users:
         name = user.get("Name", "")
@@ -80,20 +113,10 @@ def _get_human_user_ids(sf_holder: list, user_ids: list[str]) -> set[str]:
                 if license_name in NON_HUMAN_LICENSES:
                     continue
         human_ids.add(user["Id"])
-    return human_ids
-
-
-def _parse_sf_datetime(dt_str: str) -> datetime:
-    """Parse a Salesforce datetime string to a timezone-aware datetime."""
-    # Salesforce formats: 2025-12-01T11:54:37.000+0000 or ...Z
-    if dt_str.endswith("Z"):
-        dt_str = dt_str[:-1] + "+00:00"
-    elif dt_str.endswith("+0000"):
-        dt_str = dt_str[:-5] + "+00:00"
-    return datetime.fromisoformat(dt_str)
+    return frozenset(human_ids)
 
 
-def get_human_touched_opportunities(sf_holder: list) -> list[dict]:
+def get_human_touched_opportunities() -> list[dict]:
     """Return all open opportunities (last 6 months, excluding TVG), enriched with touch data.
 
     Each opportunity is enriched with:
@@ -103,45 +126,41 @@ def get_human_touched_opportunities(sf_holder: list) -> list[dict]:
       Owner.Email: str — owner's email for per-person routing
     """
     # Step 1: Get open opportunities (last 6 months, excluding TVG)
-    opps = sf_client.query(sf_holder, OPEN_OPPS_SOQL)
+    opps = sf_client.query(OPEN_OPPS_SOQL)
     if not opps:
         return []
 
     opp_ids = [o["Id"] for o in opps]
 
-    # Step 2: Get all Tasks linked to these opportunities
-    tasks = _query_batched(sf_holder, TASKS_SOQL_TEMPLATE, opp_ids)
-
-    # Step 3: Collect all user IDs that created Tasks and filter to humans
-    all_user_ids = {t["CreatedById"] for t in tasks}
-    human_ids = _get_human_user_ids(sf_holder, list(all_user_ids)) if all_user_ids else set()
-
-    # Step 4: Count human touches and track last touch date per opportunity
-    touch_count = defaultdict(int)
+    # Step 2: Get human touch counts and latest touch dates per opportunity,
+    # aggregated and human-filtered server-side. The ID batches partition the
+    # opportunity set and the aggregate groups by WhatId, so each opportunity
+    # appears exactly once — counts are stored directly, nothing is summed here
+    touch_count = {}
     last_touch = {}  # opp_id -> most recent CreatedDate string
-    for t in tasks:
-        if t["CreatedById"] in human_ids:
-            opp_id = t["WhatId"]
-            touch_count[opp_id] += 1
-            created = t["CreatedDate"]
-            if opp_id not in last_touch or created > last_touch[opp_id]:
-                last_touch[opp_id] = created
-
-    # Step 5: Enrich all opportunities with touch data
+    for row in _query_batched(TASKS_AGG_SOQL_TEMPLATE, opp_ids):
+        opp_id = row["WhatId"]
+        touch_count[opp_id] = row["cnt"]
+        last_touch[opp_id] = row["lastTouch"]
+
+    # Step 3: Enrich all opportunities with touch data
+    # Salesforce datetimes are always UTC ISO-8601, so trimming to the first
+    # 19 chars (YYYY-MM-DDTHH:MM:SS) makes staleness a plain string compare
     now = datetime.now(timezone.utc)
-    stale_cutoff = now - timedelta(days=STALE_THRESHOLD_DAYS)
+    stale_cutoff = (now - timedelta(days=STALE_THRESHOLD_DAYS)).strftime("%Y-%m-%dT%H:%M:%S")
 
     for opp in opps:
         opp_id = opp["Id"]
         opp["_touch_count"] = touch_count.get(opp_id, 0)
-        if opp_id in last_touch:
-            opp["_last_touched"] = last_touch[opp_id][:10]  # YYYY-MM-DD
-            last_dt = _parse_sf_datetime(last_touch[opp_id])
-            opp["_is_stale"] = last_dt < stale_cutoff
+        touched = last_touch.get(opp_id)
+        if touched:
+            opp["_last_touched"] = touched[:10]  # YYYY-MM-DD
+            opp["_is_stale"] = touched[:19] < stale_cutoff
         else:
             opp["_last_touched"] = "Never"
             opp["_is_stale"] = True  # no touches at all = needs attention
+        opp["_sort_key"] = (not opp["_is_stale"], -opp["_touch_count"])
 
     # Sort: stale first (high priority), then by touch count descending
-    opps.sort(key=lambda o: (not o["_is_stale"], -o["_touch_count"]))
+    opps.sort(key=_SORT_KEY)
     return opps
@@ -2,23 +2,57 @@
 
 import json
 import os
+import random
 import time
 import http.server
 import urllib.parse
 from pathlib import Path
 
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 from simple_salesforce import Salesforce
 from simple_salesforce.exceptions import SalesforceExpiredSession
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
 TOKEN_CACHE = Path(__file__).parent.parent / ".token_cache.json"
 
+# Module-level client, set by connect() and swapped in place on re-auth so
+# callers never juggle a connection handle themselves
+_CLIENT: Salesforce | None = None
+
 MAX_RETRIES = 3
 RETRY_BACKOFF = 2  # seconds, doubled each retry
 
 
+def _new_session() -> requests.Session:
+    """HTTP session with a connection pool sized for concurrent batched SOQL.
+
+    Keep-Alive reuses one TCP+TLS tunnel across the dozens of queries per run
+    instead of paying a fresh handshake each time; transient HTTP-level errors
+    are retried at the adapter layer.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    ))
+    return session
+
+
+# One pooled session for the whole module: OAuth token requests and every
+# simple_salesforce client share it, so SOQL paging and token refreshes all
+# ride the same keep-alive connections
+_HTTP = _new_session()
+
+
 def _auth_oauth() -> Salesforce:
     """Authenticate via OAuth 2.0 browser flow (local/interactive use)."""
     client_id = os.environ["SF_CLIENT_ID"]
@@ -27,20 +61,19 @@ def _auth_oauth() -> Salesforce:
     domain = os.environ.get("SF_DOMAIN") or "login"
 
     base_url = f"https://{domain}.salesforce.com"
-    auth_url = (
-        f"{base_url}/services/oauth2/authorize"
-        f"?response_type=code&client_id={client_id}"
-        f"&redirect_uri={urllib.parse.quote(redirect_uri, safe='')}"
-        f"&scope=full%20pardot_api%20refresh_token"
-    )
+    params = urllib.parse.urlencode({
+        "response_type": "code",
+        "client_id": client_id,
+        "redirect_uri": redirect_uri,
+        "scope": "full pardot_api refresh_token",
+    })
+    auth_url = f"{base_url}/services/oauth2/authorize?{params}"
 
     print(f"\nOpen this URL in your browser to log in:\n\n  {auth_url}\n")
 
     auth_code = _wait_for_callback(redirect_uri)
 
-    import requests
-
-    token_resp = requests.post(
+    token_resp = _HTTP.post(
         f"{base_url}/services/oauth2/token",
         data={
             "grant_type": "authorization_code",
@@ -54,22 +87,47 @@ def _auth_oauth() -> Salesforce:
     data = token_resp.json()
 
     _save_token(data["instance_url"], data["access_token"], data.get("refresh_token"))
-    return Salesforce(instance_url=data["instance_url"], session_id=data["access_token"])
+    return Salesforce(
+        instance_url=data["instance_url"],
+        session_id=data["access_token"],
+        session=_HTTP,
+    )
+
+
+# Parsed token cache, keyed by the file's mtime: connect() can consult the
+# token file several times in one run, and only the first read should pay the
+# open + JSON parse
+_TOKEN_MEM: tuple[int, dict] | None = None
+
+
+def _read_token() -> dict:
+    """Read and parse the token cache file, memoized on its mtime."""
+    global _TOKEN_MEM
+    st = TOKEN_CACHE.stat()
+    if _TOKEN_MEM is not None and _TOKEN_MEM[0] == st.st_mtime_ns:
+        return _TOKEN_MEM[1]
+    # json.loads accepts bytes directly, so skip read_text's decode pass
+    data = json.loads(TOKEN_CACHE.read_bytes())
+    _TOKEN_MEM = (st.st_mtime_ns, data)
+    return data
 
 
 def _save_token(instance_url: str, access_token: str, refresh_token: str | None = None):
+    global _TOKEN_MEM
     cache = {"instance_url": instance_url, "access_token": access_token}
     if refresh_token:
         cache["refresh_token"] = refresh_token
-    elif TOKEN_CACHE.exists():
-        # Preserve existing refresh token (refresh grant doesn't always return a new one)
+    else:
+        # Preserve existing refresh token (refresh grant doesn't always return
+        # a new one); a missing or corrupt cache file just means nothing to keep
         try:
-            old = json.loads(TOKEN_CACHE.read_text())
+            old = _read_token()
             if old.get("refresh_token"):
                 cache["refresh_token"] = old["refresh_token"]
-        except Exception:
+        except (OSError, ValueError):
             pass
     TOKEN_CACHE.write_text(json.dumps(cache))
+    _TOKEN_MEM = None
 
 
 def _load_cached_token() -> Salesforce | None:
@@ -77,9 +135,20 @@ def _load_cached_token() -> Salesforce | None:
     if not TOKEN_CACHE.exists():
         return None
     try:
-        data = json.loads(TOKEN_CACHE.read_text())
-        sf = Salesforce(instance_url=data["instance_url"], session_id=data["access_token"])
-        sf.describe()  # test if token is still valid
+        data = _read_token()
+        sf = Salesforce(
+            instance_url=data["instance_url"],
+            session_id=data["access_token"],
+            session=_HTTP,
+        )
+        # Probe token validity with the tiny API-versions listing instead of
+        # describe(), which downloads and parses the full sObject catalog
+        resp = _HTTP.get(
+            f"{data['instance_url']}/services/data/",
+            headers={"Authorization": f"Bearer {data['access_token']}"},
+            timeout=5,
+        )
+        resp.raise_for_status()
         return sf
     except Exception:
         return None
@@ -89,11 +158,19 @@ def _wait_for_callback(redirect_uri: str) -> str:
     """Start a tiny HTTP server to capture the OAuth callback code."""
     parsed = urllib.parse.urlparse(redirect_uri)
     port = parsed.port or 8400
+    callback_path = parsed.path or "/"
     captured = {}
 
     class Handler(http.server.BaseHTTPRequestHandler):
         def do_GET(self):
-            qs = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            request = urllib.parse.urlparse(self.path)
+            # Browsers also prefetch favicon.ico etc. — 404 those before doing
+            # any query parsing so only the real callback hits the slow path
+            if request.path != callback_path:
+                self.send_response(404)
+                self.end_headers()
+                return
+            qs = urllib.parse.parse_qs(request.query)
             code = qs.get("code", [None])[0]
             if code:
                 captured["code"] = code
@@ -109,10 +186,15 @@ def _wait_for_callback(redirect_uri: str) -> str:
             pass
 
     with http.server.HTTPServer(("0.0.0.0", port), Handler) as server:
+        # server.timeout caps each accept; the deadline caps the whole wait so
+        # a stream of non-callback requests can't keep the loop alive forever
         server.timeout = 120
+        deadline = time.monotonic() + 120
         print(f"Listening on port {port} for OAuth callback...")
         while not captured.get("code"):
             server.handle_request()
+            if not captured and time.monotonic() > deadline:
+                raise TimeoutError("OAuth callback timed out")
 
     return captured["code"]
 
@@ -131,7 +213,7 @@ def _refresh_oauth_token() -> Salesforce | None:
         if not TOKEN_CACHE.exists():
             return None
         try:
-            cache = json.loads(TOKEN_CACHE.read_text())
+            cache = _read_token()
             refresh_token = cache.get("refresh_token")
             instance_url = cache.get("instance_url")
             if not refresh_token:
@@ -144,9 +226,7 @@ def _refresh_oauth_token() -> Salesforce | None:
     domain = os.environ.get("SF_DOMAIN") or "login"
     base_url = f"https://{domain}.salesforce.com"
 
-    import requests
-
-    resp = requests.post(
+    resp = _HTTP.post(
         f"{base_url}/services/oauth2/token",
         data={
             "grant_type": "refresh_token",
@@ -160,7 +240,11 @@ def _refresh_oauth_token() -> Salesforce | None:
 
     data = resp.json()
     _save_token(data["instance_url"], data["access_token"], data.get("refresh_token"))
-    return Salesforce(instance_url=data["instance_url"], session_id=data["access_token"])
+    return Salesforce(
+        instance_url=data["instance_url"],
+        session_id=data["access_token"],
+        session=_HTTP,
+    )
 
 
 def _reconnect() -> Salesforce:
@@ -172,51 +256,98 @@ def _reconnect() -> Salesforce:
 
 
 def connect() -> Salesforce:
-    """Connect to Salesforce using OAuth.
+    """Connect to Salesforce using OAuth and cache the client module-wide.
 
     Tries (in order): cached token, refresh token, full browser OAuth flow.
     """
+    global _CLIENT
+
     # Try cached access token (local dev)
-    cached = _load_cached_token()
-    if cached:
-        return cached
+    sf = _load_cached_token()
 
     # Try refresh token (works in both local and CI)
-    refreshed = _refresh_oauth_token()
-    if refreshed:
-        return refreshed
+    if sf is None:
+        sf = _refresh_oauth_token()
 
     # Full OAuth browser flow (local only — will fail in CI if refresh token is invalid)
-    return _auth_oauth()
+    if sf is None:
+        sf = _auth_oauth()
+
+    _CLIENT = sf
+    return sf
 
 
-def _with_retry(sf_holder: list, func):
+def _with_retry(func):
     """Execute func(sf) with retry on transient errors and token refresh on expired session.
 
-    sf_holder is a single-element list so we can swap the connection on re-auth.
+    The module-level client is swapped in place on re-auth, so in-flight
+    callers pick up the fresh connection on their next attempt.
     """
+    global _CLIENT
+    if _CLIENT is None:
+        connect()
+
     last_exc = None
-    for attempt in range(MAX_RETRIES):
+    attempt = 0
+    auth_retries = 0
+    while attempt < MAX_RETRIES:
         try:
-            return func(sf_holder[0])
+            return func(_CLIENT)
         except SalesforceExpiredSession:
-            sf_holder[0] = _reconnect()
-            continue
+            # Re-auth is tracked separately from transient retries: it doesn't
+            # burn a transient attempt, but if a fresh connection still comes
+            # back expired, retrying further would loop forever — give up
+            if auth_retries >= 1:
+                raise
+            auth_retries += 1
+            _CLIENT = _reconnect()
         except Exception as e:
             last_exc = e
-            if attempt < MAX_RETRIES - 1:
-                wait = RETRY_BACKOFF * (2 ** attempt)
+            attempt += 1
+            if attempt < MAX_RETRIES:
+                # Jitter the exponential backoff so parallel batch workers
+                # don't hammer the API in lockstep after a shared hiccup
+                wait = RETRY_BACKOFF * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
                 time.sleep(wait)
-            continue
     raise last_exc
 
 
-def query(sf_holder: list, soql: str) -> list[dict]:
-    """Run a SOQL query with retry. sf_holder is [sf_connection]."""
+def query(soql: str) -> list[dict]:
+    """Run a SOQL query with retry against the module-level connection."""
     def _do(sf):
-        result = sf.query_all(soql)
-        records = result.get("records", [])
-        for r in records:
+        # query_all_iter pages lazily, so attributes are stripped as each
+        # 2000-row page arrives instead of in a second full pass over a
+        # completely buffered result set
+        records = []
+        for r in sf.query_all_iter(soql):
             r.pop("attributes", None)
+            records.append(r)
         return records
-    return _with_retry(sf_holder, _do)
+    return _with_retry(_do)
+
+
+def query_iter(soql: str):
+    """Run a SOQL query, yielding records as each 2000-row page arrives.
+
+    Salesforce pages large results via nextRecordsUrl; query_all blocks until
+    every page is buffered, while this generator lets the caller process one
+    page during the network wait for the next. Expired sessions are re-auth'd
+    and the query restarted, but only before the first record is yielded —
+    a mid-stream restart would duplicate records, so that case propagates.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        connect()
+
+    for attempt in range(2):
+        yielded = False
+        try:
+            for r in _CLIENT.query_all_iter(soql):
+                r.pop("attributes", None)
+                yielded = True
+                yield r
+            return
+        except SalesforceExpiredSession:
+            if yielded or attempt:
+                raise
+            _CLIENT = _reconnect()
@@ -40,11 +40,10 @@ def main():
 
     print("Connecting to Salesforce...")
     sf = sf_client.connect()
-    sf_holder = [sf]
     print(f"Connected to {sf.sf_instance}")
 
     print("Finding untagged TVOM Vineyards opportunities...")
-    opps = sf_client.query(sf_holder, FIND_UNTAGGED_SOQL)
+    opps = sf_client.query(FIND_UNTAGGED_SOQL)
     print(f"Found {len(opps)} untagged opportunities")
 
     if not opps: